@@ -113,15 +113,15 @@ class ObserverQuantizer(Quantizer):
             layer_name = layer.name
             module = layer.module
             if "weight" in config.get("quant_types", []):
-                all_observers[layer_name]["weight"] = default_weight_observer()
+                all_observers[layer_name]["weight"] = default_weight_observer().to(self.device)
                 setattr(module, "weight_qmax", weight_qmax)
                 setattr(module, "weight_qmin", weight_qmin)
             if "input" in config.get("quant_types", []):
-                all_observers[layer_name]["input"] = default_histogram_observer()
+                all_observers[layer_name]["input"] = default_histogram_observer().to(self.device)
                 setattr(module, "input_qmax", output_qmax)
                 setattr(module, "input_qmin", output_qmin)
             if "output" in config.get("quant_types", []):
-                all_observers[layer_name]["output"] = default_histogram_observer()
+                all_observers[layer_name]["output"] = default_histogram_observer().to(self.device)
                 setattr(module, "output_qmax", output_qmax)
                 setattr(module, "output_qmin", output_qmin)
         self.all_observers = all_observers
@@ -144,7 +144,13 @@ class ObserverQuantizer(Quantizer):
     def record(self, wrapper, quant_type, tensor):
         name = wrapper.name
         observer = self.all_observers[name][quant_type]
-        observer(tensor.cpu())
+        # observers live on the same device as the model, so statistics are
+        # accumulated there without copying every calibration tensor to host.
+        # Tensors from other devices (DataParallel replicas, model parallel layers)
+        # are moved over, the observer state can only live on one device
+        if tensor.device != self.device:
+            tensor = tensor.to(self.device)
+        observer(tensor)
 
     def calculate_qparams(self, name, quant_type):
         observer = self.all_observers[name][quant_type]
@@ -152,44 +158,34 @@ class ObserverQuantizer(Quantizer):
         return scale, zero_point
 
     def _quantize(self, x, scale, zero_point, qmin, qmax):
-        x = x / scale + zero_point
-        x = torch.clamp(x, qmin, qmax)
-        x = torch.round(x)
-        x = (x - zero_point) * scale
-        return x
+        # round after adding the zero point, the same as QAT_Quantizer. The fused
+        # torch.fake_quantize_per_tensor_affine rounds before it, which breaks .5 ties
+        # differently for the odd zero points of the affine activation observers.
+        # x belongs to the caller, so only the division allocates and the rest works in place
+        return (x / scale).add_(zero_point).clamp_(qmin, qmax).round_().sub_(zero_point).mul_(scale)
 
     def quantize_input(self, inputs, wrapper, **kwargs):
         if self.compressed:
             module = wrapper.module
-            inputs = self._quantize(inputs,
-                                      module.input_scale,
-                                      module.input_zero_point,
-                                      module.input_qmin,
-                                      module.input_qmax)
-        else:
-            self.record(wrapper, 'input', inputs)
+            return self._quantize(inputs, module.input_scale, module.input_zero_point,
+                                  module.input_qmin, module.input_qmax)
+        self.record(wrapper, 'input', inputs)
         return inputs
 
     def quantize_weight(self, wrapper, **kwargs):
+        # Weights stay constant during calibration, so their statistics are collected
+        # once in ObserverQuantizer.compress rather than on every forward pass.
         # If ObserverQuantizer.compress is executed, the weight will be set to
         # the Pseudo-quantized one. So there is no need to quantize it
-        if self.compressed:
-            return
-        weight = wrapper.module.weight
-        self.record(wrapper, 'weight', weight)
+        return
 
     def quantize_output(self, output, wrapper, **kwargs):
         if self.compressed:
             module = wrapper.module
-            new_output = self._quantize(output,
-                                       module.output_scale,
-                                       module.output_zero_point,
-                                       module.output_qmin,
-                                       module.output_qmax)
-        else:
-            self.record(wrapper, 'output', output)
-            new_output = output
-        return new_output
+            return self._quantize(output, module.output_scale, module.output_zero_point,
+                                  module.output_qmin, module.output_qmax)
+        self.record(wrapper, 'output', output)
+        return output
 
     def compress(self):
         """
@@ -197,29 +193,30 @@ class ObserverQuantizer(Quantizer):
         the compressed model will no longer update the corresponding. Instead, the quantization
         process will be simulated, which is used to test the accuracy of the quantization.
         """
-        modules_to_compress = self.get_modules_to_compress()
-        for layer, config in modules_to_compress:
-            module = layer.module
-            if "weight" in config.get("quant_types", []):
-                scale, zero_point = self.calculate_qparams(layer.name, 'weight')
-                module.register_buffer('weight_scale', scale.to(self.device))
-                module.register_buffer('weight_zero_point', zero_point.to(self.device))
+        device = self.device
+        for wrapper in self.get_modules_wrapper():
+            # bind per-layer lookups once, nn.Module attribute access goes through
+            # the _parameters/_buffers/_modules dicts on every read
+            name, module = wrapper.name, wrapper.module
+            quant_types = wrapper.config.get("quant_types", [])
+            if "weight" in quant_types:
                 weight = module.weight
-                quantized_weight = self._quantize(weight,
-                                            module.weight_scale,
-                                            module.weight_zero_point,
-                                            module.weight_qmin,
-                                            module.weight_qmax)
+                self.record(wrapper, 'weight', weight)
+                scale, zero_point = self.calculate_qparams(name, 'weight')
+                scale, zero_point = scale.to(device), zero_point.to(device)
+                module.register_buffer('weight_scale', scale)
+                module.register_buffer('weight_zero_point', zero_point)
+                quantized_weight = self._quantize(weight, scale, zero_point, module.weight_qmin, module.weight_qmax)
                 delattr(module, 'weight')
                 module.register_buffer('weight', quantized_weight)
-            if "input" in config.get("quant_types", []):
-                scale, zero_point = self.calculate_qparams(layer.name, 'input')
-                module.register_buffer('input_scale', scale.to(self.device))
-                module.register_buffer('input_zero_point', zero_point.to(self.device))
-            if "output" in config.get("quant_types", []):
-                scale, zero_point = self.calculate_qparams(layer.name, 'output')
-                module.register_buffer('output_scale', scale.to(self.device))
-                module.register_buffer('output_zero_point', zero_point.to(self.device))
+            if "input" in quant_types:
+                scale, zero_point = self.calculate_qparams(name, 'input')
+                module.register_buffer('input_scale', scale.to(device))
+                module.register_buffer('input_zero_point', zero_point.to(device))
+            if "output" in quant_types:
+                scale, zero_point = self.calculate_qparams(name, 'output')
+                module.register_buffer('output_scale', scale.to(device))
+                module.register_buffer('output_zero_point', zero_point.to(device))
         self.compressed = True
         super().compress()
 
@@ -22,6 +22,10 @@ from nni.compression.pytorch.quantization.utils import (
 
 logger = logging.getLogger(__name__)
 
+# lower bound of quantization scale, kept as a python scalar so that no tensor
+# is allocated for it on each call of `update_quantization_param`
+_SCALE_EPS = torch.finfo(torch.float32).eps
+
 
 class QATGrad(QuantGrad):
     @staticmethod
@@ -59,51 +63,51 @@ def update_quantization_param(bits, rmin, rmax, dtype, scheme):
     # I think this is for activations that need to be pad in the training.
     # However this is a default behavior in PyTorch quantization observer.
     # So we also make it a default behavior
-    rmin = torch.min(rmin, torch.zeros_like(rmin))
-    rmax = torch.max(rmax, torch.zeros_like(rmax))
+    rmin = torch.clamp(rmin, max=0)
+    rmax = torch.clamp(rmax, min=0)
     zero_point = torch.zeros_like(rmin)
 
     # todo: there is no need to calculate qmin and qmax again
     qmin, qmax = calculate_qmin_qmax(bits, dtype)
 
+    # a zero scale (rmin == rmax == 0) would turn the zero point and the quantized
+    # values into inf/nan, so the scale is lower bounded by eps
     if scheme in [QuantScheme.PER_TENSOR_SYMMETRIC, QuantScheme.PER_CHANNEL_SYMMETRIC]:
         abs_max = torch.max(torch.abs(rmin), torch.abs(rmax))
-        scale = abs_max / (float(qmax - qmin) / 2)
+        scale = torch.clamp(abs_max / (float(qmax - qmin) / 2), min=_SCALE_EPS)
         if dtype == QuantDtype.UINT:
             zero_point_val = (qmin + qmax) // 2
             zero_point = zero_point.new_full(zero_point.size(), zero_point_val)
     else:
-        scale = (rmax - rmin) / float(qmax - qmin)
-        zero_point = qmin - torch.round(rmin / scale)
-
-    zero_point = torch.clamp(zero_point, qmin, qmax)
+        scale = torch.clamp((rmax - rmin) / float(qmax - qmin), min=_SCALE_EPS)
+        # qmin - round(rmin / scale), rounded and shifted in place on the division result
+        zero_point = (rmin / scale).round_().neg_().add_(qmin)
 
-    # todo: add these lines
-    # eps = torch.finfo(torch.float32).eps
-    # scale = torch.max(scale, eps)
+    # zero_point is always a freshly created tensor here, so it is clamped in place
+    zero_point.clamp_(qmin, qmax)
 
     return scale, zero_point
 
 
 def update_ema(biased_ema, value, decay):
     """
-    calculate biased stat and unbiased stat in each step using exponential moving average method
+    calculate biased stat and unbiased stat in each step using exponential moving average method.
+    `biased_ema` is updated in place, so tracked buffers can be passed directly without an extra copy.
 
     Parameters
     ----------
-    biased_ema : float
-        previous stat value
-    value : float
+    biased_ema : Tensor
+        previous stat value, updated in place
+    value : Tensor
         current stat value
     decay : float
         the weight of previous stat value, larger means smoother curve
 
     Returns
     -------
-    float, float
+    Tensor
     """
-    biased_ema = biased_ema * decay + (1 - decay) * value
-    return biased_ema
+    return biased_ema.mul_(decay).add_((1 - decay) * value)
 
 
 class QAT_Quantizer(Quantizer):
@@ -237,6 +241,8 @@ class QAT_Quantizer(Quantizer):
         modules_to_compress = self.get_modules_to_compress()
         device = next(model.parameters()).device
         self.bound_model.register_buffer("steps", torch.tensor(1))
+        # quantization buffers are allocated on the target device directly rather than
+        # being created on cpu and then copied one by one by `self.bound_model.to(device)`
         for layer, config in modules_to_compress:
             module = layer.module
             name = layer.name
@@ -264,22 +270,22 @@ class QAT_Quantizer(Quantizer):
 
             if "weight" in config.get("quant_types", []):
                 quant_shape = get_quant_shape(module.weight.shape, QuantType.WEIGHT, layer_quant_setting.weight.quant_scheme)
-                module.register_buffer('weight_scale', torch.zeros(quant_shape))
-                module.register_buffer('weight_zero_point', torch.zeros(quant_shape))
+                module.register_buffer('weight_scale', torch.zeros(quant_shape, device=device))
+                module.register_buffer('weight_zero_point', torch.zeros(quant_shape, device=device))
 
             if "input" in config.get("quant_types", []):
                 quant_shape = get_quant_shape(input_shape, QuantType.INPUT, layer_quant_setting.input.quant_scheme)
-                module.register_buffer('tracked_min_input', torch.zeros(quant_shape))
-                module.register_buffer('tracked_max_input', torch.zeros(quant_shape))
-                module.register_buffer('input_scale', torch.zeros(quant_shape))
-                module.register_buffer('input_zero_point', torch.zeros(quant_shape))
+                module.register_buffer('tracked_min_input', torch.zeros(quant_shape, device=device))
+                module.register_buffer('tracked_max_input', torch.zeros(quant_shape, device=device))
+                module.register_buffer('input_scale', torch.zeros(quant_shape, device=device))
+                module.register_buffer('input_zero_point', torch.zeros(quant_shape, device=device))
 
             if "output" in config.get("quant_types", []):
                 quant_shape = get_quant_shape(output_shape, QuantType.OUTPUT, layer_quant_setting.output.quant_scheme)
-                module.register_buffer('tracked_min_output', torch.zeros(quant_shape))
-                module.register_buffer('tracked_max_output', torch.zeros(quant_shape))
-                module.register_buffer('output_scale', torch.zeros(quant_shape))
-                module.register_buffer('output_zero_point', torch.zeros(quant_shape))
+                module.register_buffer('tracked_min_output', torch.zeros(quant_shape, device=device))
+                module.register_buffer('tracked_max_output', torch.zeros(quant_shape, device=device))
+                module.register_buffer('output_scale', torch.zeros(quant_shape, device=device))
+                module.register_buffer('output_zero_point', torch.zeros(quant_shape, device=device))
 
             setattr(module, "layer_quant_setting", layer_quant_setting)
         self.bound_model.to(device)
@@ -352,9 +358,8 @@ class QAT_Quantizer(Quantizer):
         -------
         Tensor
         """
-        transformed_val = zero_point + real_value / scale
-        clamped_val = torch.clamp(transformed_val, qmin, qmax)
-        quantized_val = torch.round(clamped_val)
+        # only the division allocates, the following steps work in place on its result
+        quantized_val = (real_value / scale).add_(zero_point).clamp_(qmin, qmax).round_()
         return quantized_val
 
     def _dequantize(self, quantized_val, scale, zero_point):
@@ -376,7 +381,7 @@ class QAT_Quantizer(Quantizer):
         -------
         Tensor
         """
-        real_val = scale * (quantized_val - zero_point)
+        real_val = (quantized_val - zero_point).mul_(scale)
         return real_val
 
     def quantize_weight(self, wrapper, **kwargs):
@@ -447,10 +452,8 @@ class QAT_Quantizer(Quantizer):
             module.tracked_min_input.copy_(current_min)
             module.tracked_max_input.copy_(current_max)
 
-        tracked_min_input = update_ema(module.tracked_min_input, current_min, ema_decay)
-        tracked_max_input = update_ema(module.tracked_max_input, current_max, ema_decay)
-        module.tracked_min_input.copy_(tracked_min_input)
-        module.tracked_max_input.copy_(tracked_max_input)
+        update_ema(module.tracked_min_input, current_min, ema_decay)
+        update_ema(module.tracked_max_input, current_max, ema_decay)
 
         if quant_start_step > int(self.bound_model.steps):
             return inputs
@@ -492,10 +495,8 @@ class QAT_Quantizer(Quantizer):
             module.tracked_min_output.copy_(current_min)
             module.tracked_max_output.copy_(current_max)
 
-        tracked_min_output = update_ema(module.tracked_min_output, current_min, ema_decay)
-        tracked_max_output = update_ema(module.tracked_max_output, current_max, ema_decay)
-        module.tracked_min_output.copy_(tracked_min_output)
-        module.tracked_max_output.copy_(tracked_max_output)
+        update_ema(module.tracked_min_output, current_min, ema_decay)
+        update_ema(module.tracked_max_output, current_max, ema_decay)
 
         if quant_start_step > int(self.bound_model.steps):
             return output
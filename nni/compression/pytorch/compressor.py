@@ -521,32 +521,36 @@ class QuantizerModuleWrapper(torch.nn.Module):
         self.config = config
         self.quantizer = quantizer
         self.bn_module = bn_module
+        # the quantization paths are fixed by the config and the module, resolve them
+        # once instead of checking quant_types and the weight attribute on every forward
+        self._quant_input = 'input' in config['quant_types']
+        self._quant_weight = 'weight' in config['quant_types'] and _check_weight(self.module)
+        self._quant_output = 'output' in config['quant_types']
 
         # register buffer and parameter
         # old_weight is used to store origin weight and weight is used to store quantized weight
         # the reason why weight is buffer instead of parameter is because in pytorch parameter is used as leaf
         # if weight is leaf , then old_weight can not be updated.
-        if 'weight' in config['quant_types']:
-            if not _check_weight(self.module):
-                _logger.warning('Module %s does not have parameter "weight"', self.name)
-            else:
-                self.module.register_parameter('old_weight', torch.nn.Parameter(self.module.weight))
-                delattr(self.module, 'weight')
-                self.module.register_buffer('weight', self.module.old_weight.data)
-
-                # for batch normalization folding
-                if self.bn_module is not None:
-                    if _check_bias(self.module):
-                        self.module.register_parameter('old_bias', torch.nn.Parameter(self.module.bias))
-                        init_tensor = self.module.old_bias.data
-                    else:
-                        init_tensor = torch.zeros_like(self.bn_module.weight)
-                    delattr(self.module, 'bias')
-                    self.module.register_buffer('bias', init_tensor)
-                    setattr(module, BN_FOLD_TAG, True)
+        if 'weight' in config['quant_types'] and not self._quant_weight:
+            _logger.warning('Module %s does not have parameter "weight"', self.name)
+        if self._quant_weight:
+            self.module.register_parameter('old_weight', torch.nn.Parameter(self.module.weight))
+            delattr(self.module, 'weight')
+            self.module.register_buffer('weight', self.module.old_weight.data)
+
+            # for batch normalization folding
+            if self.bn_module is not None:
+                if _check_bias(self.module):
+                    self.module.register_parameter('old_bias', torch.nn.Parameter(self.module.bias))
+                    init_tensor = self.module.old_bias.data
+                else:
+                    init_tensor = torch.zeros_like(self.bn_module.weight)
+                delattr(self.module, 'bias')
+                self.module.register_buffer('bias', init_tensor)
+                setattr(module, BN_FOLD_TAG, True)
 
     def forward(self, *inputs):
-        if 'input' in self.config['quant_types']:
+        if self._quant_input:
             assert len(inputs) == 1, "Quantization of input only supports ops with single input."
             new_inp = self.quantizer.quant_grad(
                 inputs[0],
@@ -554,7 +558,7 @@ class QuantizerModuleWrapper(torch.nn.Module):
                 self)
             inputs = (new_inp,)
 
-        if 'weight' in self.config['quant_types'] and _check_weight(self.module):
+        if self._quant_weight:
             if self.bn_module is not None:
                 # simulate batch normalization folding
                 new_weight, new_bias = self.quantizer.fold_bn(*inputs, wrapper=self)
@@ -571,7 +575,7 @@ class QuantizerModuleWrapper(torch.nn.Module):
 
         result = self.module(*inputs)
 
-        if 'output' in self.config['quant_types']:
+        if self._quant_output:
             result = self.quantizer.quant_grad(
                 result,
                 QuantType.OUTPUT,
@@ -690,15 +694,17 @@ class Quantizer(Compressor):
             _ = bn_module(output)
         running_mean = bn_module.running_mean
         running_var = torch.sqrt(bn_module.running_var + bn_module.eps)
-        bn_weight = bn_module.weight
         bn_bias = bn_module.bias
+        # per-channel folding factor, computed once on the small channel vector so that
+        # the full-size weight only needs a single multiplication
+        factor = bn_module.weight / running_var
         dimensions = len(module.weight.shape)
         shape = [-1] + [1] * (dimensions - 1)
-        new_weight = module.old_weight * bn_weight.reshape(shape) / running_var.reshape(shape)
+        new_weight = module.old_weight * factor.reshape(shape)
         if hasattr(module, 'old_bias'):
-            new_bias = bn_bias + (module.old_bias - running_mean) / running_var * bn_weight
+            new_bias = bn_bias + (module.old_bias - running_mean) * factor
         else:
-            new_bias = bn_bias - running_mean / running_var * bn_weight
+            new_bias = bn_bias - running_mean * factor
         return new_weight, new_bias
 
     def _wrap_modules(self, layer, config):
@@ -928,7 +934,7 @@ class QuantGrad(torch.autograd.Function):
         tensor
             quantized x without clamped
         """
-        return ((x / scale) + zero_point).round()
+        return (x / scale).add_(zero_point).round_()
 
     @classmethod
     def get_bits_length(cls, config, quant_type):
@@ -41,12 +41,22 @@ def get_min_max_value(x, quant_type, quant_scheme):
 
     target_dim = get_target_dim(quant_type, quant_scheme)
     if target_dim is None:
+        if TORCH_VERSION >= (1, 11):
+            # single reduction kernel instead of separate min and max passes
+            return torch.aminmax(x)
         return torch.min(x), torch.max(x)
 
     indices = list(range(len(x.shape)))
     assert target_dim < len(indices), "target_dim needs to be less than the number of dim of the tensor"
     del indices[target_dim]
 
+    if TORCH_VERSION >= (1, 11) and target_dim == 0 and len(indices) > 0:
+        # channels are the leading dim (weights), reduce all other dims at once
+        # with a single aminmax kernel over a flattened view
+        min_val, max_val = torch.aminmax(x.flatten(1), dim=1)
+        keepdim_shape = [-1] + [1] * len(indices)
+        return min_val.view(keepdim_shape), max_val.view(keepdim_shape)
+
     if TORCH_VERSION > (1, 6):
         min_val = torch.amin(x, indices, keepdims=True)
         max_val = torch.amax(x, indices, keepdims=True)
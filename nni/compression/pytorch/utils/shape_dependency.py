@@ -604,7 +604,7 @@ class ReshapeDependency(Dependency):
             if node.op_type in ['aten::view', 'aten::reshape']:
                 logger.info('Detect reshape-like functions: %s', node.op_type)
                 parent_layers = self._get_parent_layers(node)
-                print('Parent layers', parent_layers)
+                logger.debug('Parent layers: %s', parent_layers)
                 self.dependency[node.unique_name] = parent_layers
 
     def export(self, filepath):
@@ -9,7 +9,9 @@ Configuration for slurm training service.
 
 __all__ = ['SlurmConfig']
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Union, Dict
 import warnings
@@ -24,6 +26,48 @@ from .. import utils
 def stringify(obj):
     return None if obj is None else str(obj).replace('_', '-')
 
+@lru_cache(maxsize=1)
+def _ensure_wandb():
+    """
+    Import wandb, check its version and make sure it is logged in. Done once per process,
+    failures are not cached so they are raised again on the next validation.
+    """
+    try:
+        import wandb
+    except ImportError:
+        raise ImportError('Please install wandb by "pip install wandb==0.12.9" to enable weight and bias.')
+    if wandb.__version__ != '0.12.9':
+        warnings.warn(f'Version of wandb is {wandb.__version__} instead of 0.12.9. The codes might not work as expected.')
+    if not wandb.login(anonymous='allow'):
+        raise RuntimeError('wandb api key is not correctly configured. Please try "wandb login --anonymously" to generate an account.')
+    return wandb
+
+@lru_cache(maxsize=None)
+def _get_wandb_account(base_url):
+    """
+    Query the account information exposed to webui from the wandb server at ``base_url``.
+    The result is cached, so validating many configs in one process only hits the server once.
+    The independent server queries are issued concurrently.
+    """
+    import wandb
+    from wandb.sdk.lib import apikey
+    from wandb.apis import internal
+    from six.moves.urllib.parse import urlencode
+    api = internal.Api()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        anonymous = executor.submit(lambda: api.settings().get("anonymous"))
+        entity = executor.submit(lambda: wandb.setup(settings=wandb.Settings())._get_entity())
+        if anonymous.result() != "true":
+            qs = ""
+        else:
+            api_key = apikey.api_key(settings=wandb.Settings())
+            qs = "?" + urlencode({"apiKey": api_key})
+        return {
+            'app_url': wandb.util.app_url(base_url),
+            'entity': entity.result(),
+            'qs': qs
+        }
+
 @dataclass(init=False)
 class SlurmConfig(TrainingServiceConfig):
     platform: Literal['slurm'] = 'slurm'
@@ -43,31 +87,7 @@ class SlurmConfig(TrainingServiceConfig):
         super()._validate_canonical()
         
         if self.useWandb:
-            try:
-                import wandb
-                if wandb.__version__ != '0.12.9':
-                    print(f"WARNING: Version of wandb is {wandb.__version__} instead of 0.12.9. The codes might not work as expected.")
-            except:
-                raise ImportError('Please install wandb by "pip install wandb==0.12.9" to enable weight and bias.')
-            
-            if not wandb.login(anonymous='allow'):
-                raise RuntimeError('wandb api key is not correctly configured. Please try "wandb login --anonymously" to generate an account.')
-        
+            wandb = _ensure_wandb()
             if self.wandbAccount is None:
                 # expose username and apikey to webui
-                from wandb.sdk.lib import apikey
-                from wandb.apis import internal
-                from six.moves.urllib.parse import urlencode
-                app_url = wandb.util.app_url(wandb.Settings().base_url)
-                api = internal.Api()
-                if api.settings().get("anonymous") != "true":
-                    qs = ""
-                else:
-                    api_key = apikey.api_key(settings=wandb.Settings())
-                    qs = "?" + urlencode({"apiKey": api_key})
-                entity = wandb.setup(settings=wandb.Settings())._get_entity()
-                self.wandbAccount = {
-                    'app_url': app_url,
-                    'entity': entity,
-                    'qs': qs
-                }
\ No newline at end of file
+                self.wandbAccount = dict(_get_wandb_account(wandb.Settings().base_url))
@@ -9,7 +9,7 @@ import torch.nn.functional as F
 import schema
 import nni.algorithms.compression.pytorch.pruning as torch_pruner
 import nni.algorithms.compression.pytorch.quantization as torch_quantizer
-from nni.compression.pytorch.quantization.utils import calculate_qmin_qmax, get_quant_shape
+from nni.compression.pytorch.quantization.utils import calculate_qmin_qmax, get_min_max_value, get_quant_shape
 import math
 
 
@@ -307,6 +307,92 @@ class CompressorTestCase(TestCase):
         self.assertTrue(calibration_config is not None)
         self.assertTrue(len(calibration_config) == 4)
 
+    def test_torch_observer_quantizer_activation(self):
+        class ConvModel(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.conv = torch.nn.Conv2d(1, 3, 3, 1)
+
+            def forward(self, x):
+                return self.conv(x)
+
+        def fake_quantize(x, scale, zero_point, qmin, qmax):
+            return (torch.round(torch.clamp(x / scale + zero_point, qmin, qmax)) - zero_point) * scale
+
+        def expected_output(module, x):
+            x = fake_quantize(x, module.input_scale, module.input_zero_point, module.input_qmin, module.input_qmax)
+            y = F.conv2d(x, module.weight, module.bias)
+            return fake_quantize(y, module.output_scale, module.output_zero_point,
+                                 module.output_qmin, module.output_qmax)
+
+        model = ConvModel().eval()
+        config_list = [{
+            'quant_types': ['input', 'output'],
+            'quant_bits': 8,
+            'op_types': ['Conv2d']
+        }]
+        quantizer = torch_quantizer.ObserverQuantizer(model, config_list)
+        for _ in range(3):
+            model(torch.randn(2, 1, 8, 8))
+        quantizer.compress()
+
+        module = model.conv.module
+        input = torch.randn(2, 1, 8, 8)
+        self.assertTrue(torch.equal(model(input), expected_output(module, input)))
+
+        # .5 ties with an odd zero point are rounded after adding the zero point, like QAT_Quantizer
+        tie = quantizer._quantize(torch.tensor([0.5, 1.5]), torch.tensor([1.]), torch.tensor([3]), 0, 127)
+        self.assertTrue(torch.equal(tie, torch.tensor([1., 1.])))
+
+        # inference must follow the buffers, e.g. when qparams are restored from a checkpoint
+        state_dict = copy.deepcopy(model.state_dict())
+        state_dict['conv.module.input_scale'] *= 2
+        state_dict['conv.module.output_scale'] *= 3
+        state_dict['conv.module.output_zero_point'] += 1
+        model.load_state_dict(state_dict)
+        self.assertTrue(torch.equal(module.input_scale, state_dict['conv.module.input_scale']))
+        self.assertTrue(torch.equal(model(input), expected_output(module, input)))
+
+    def test_torch_observer_quantizer_record_device(self):
+        # calibration tensors may come from another device than the model's first
+        # parameter, e.g. DataParallel replicas or model parallel layers
+        class DeviceCheckObserver(torch.nn.Module):
+            def __init__(self, observer, device):
+                super().__init__()
+                self.observer = observer
+                self.device = device
+                self.received = []
+
+            def forward(self, x):
+                assert x.device == self.device
+                self.received.append(x)
+                return self.observer(x)
+
+            def calculate_qparams(self):
+                return self.observer.calculate_qparams()
+
+        model = TorchModel().eval()
+        config_list = [{
+            'quant_types': ['input', 'output'],
+            'quant_bits': 8,
+            'op_types': ['Conv2d']
+        }]
+        quantizer = torch_quantizer.ObserverQuantizer(model, config_list)
+        observer = DeviceCheckObserver(quantizer.all_observers['conv1']['input'], quantizer.device)
+        quantizer.all_observers['conv1']['input'] = observer
+
+        # tensors already on the observer device are fed as is
+        calib = torch.randn(2, 1, 28, 28)
+        quantizer.record(model.conv1, 'input', calib)
+        self.assertIs(observer.received[-1], calib)
+        if torch.cuda.is_available():
+            calib = torch.randn(2, 1, 28, 28, device='cuda')
+            quantizer.record(model.conv1, 'input', calib)
+            self.assertTrue(torch.equal(observer.received[-1], calib.to(quantizer.device)))
+        model(torch.randn(2, 1, 28, 28))
+        quantizer.compress()
+        self.assertTrue(torch.all(model.conv1.module.input_scale > 0))
+
     def test_torch_quantizer_weight_type(self):
         quantizer_list = [
             torch_quantizer.QAT_Quantizer,
@@ -522,6 +608,88 @@ class CompressorTestCase(TestCase):
         self.assertTrue(torch.equal(model.relu.module.tracked_min_output, torch.tensor([0.002])))
         self.assertTrue(torch.equal(model.relu.module.tracked_max_output, torch.tensor([0.2060])))
 
+    def test_torch_QAT_quantizer_buffers_updated_in_place(self):
+        # qparams must be written into the registered buffers, replicas created by
+        # torch.nn.DataParallel only share these tensor objects with the master model
+        model = TorchModel()
+        config_list = [{
+            'quant_types': ['weight', 'input', 'output'],
+            'quant_bits': 8,
+            'op_types': ['Conv2d', 'Linear']
+        }]
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.01, momentum=0.5)
+        dummy = torch.randn(1, 1, 28, 28)
+        quantizer = torch_quantizer.QAT_Quantizer(model, config_list, optimizer, dummy_input=dummy)
+        quantizer.compress()
+        buffer_names = ['weight_scale', 'weight_zero_point', 'input_scale', 'input_zero_point',
+                        'output_scale', 'output_zero_point']
+        registered = {name: getattr(model.fc1.module, name) for name in buffer_names}
+
+        model.train()
+        model(torch.randn(2, 1, 28, 28))
+        quantizer.step_with_optimizer()
+
+        for name, buffer in registered.items():
+            self.assertIs(getattr(model.fc1.module, name), buffer)
+        self.assertTrue(torch.all(registered['weight_scale'] > 0))
+        self.assertTrue(torch.all(registered['input_scale'] > 0))
+        self.assertTrue(torch.all(registered['output_scale'] > 0))
+
+    def test_torch_QAT_quantizer_eval_mode(self):
+        # evaluation mode must quantize a tensor exactly like training mode does with the same qparams
+        class TestModel(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.conv1 = torch.nn.Conv2d(1, 2, 3, 1)
+
+            def forward(self, x):
+                return self.conv1(x)
+
+        for qscheme in ['per_tensor_affine', 'per_channel_symmetric']:
+            config_list = [{
+                'quant_types': ['weight', 'input'],
+                'quant_bits': 8,
+                'op_types': ['Conv2d'],
+                'quant_dtype': 'uint',
+                'quant_scheme': qscheme
+            }]
+            model = TestModel()
+            optimizer = torch.optim.SGD(model.parameters(), lr=0.01, momentum=0.5)
+            dummy = torch.randn(1, 1, 4, 4)
+            quantizer = torch_quantizer.QAT_Quantizer(model, config_list, optimizer, dummy_input=dummy)
+            quantizer.compress()
+            wrapper = model.conv1
+            inp = torch.randn(1, 1, 4, 4)
+
+            train_weight = quantizer.quantize_weight(wrapper)
+            train_input = quantizer.quantize_input(inp, wrapper)
+            model.eval()
+            wrapper.module.weight = wrapper.module.old_weight.data
+            eval_weight = quantizer.quantize_weight(wrapper)
+            eval_input = quantizer.quantize_input(inp, wrapper)
+            self.assertTrue(torch.equal(train_weight, eval_weight))
+            self.assertTrue(torch.equal(train_input, eval_input))
+
+    def test_qat_quantization_param_zero_range(self):
+        # all-zero statistics (e.g. a dead relu) must not produce a zero scale
+        from nni.algorithms.compression.pytorch.quantization.qat_quantizer import update_quantization_param
+        for qscheme in ['per_tensor_affine', 'per_tensor_symmetric']:
+            scale, zero_point = update_quantization_param(8, torch.zeros([1]), torch.zeros([1]), 'uint', qscheme)
+            self.assertTrue(torch.all(scale > 0))
+            self.assertTrue(torch.all(torch.isfinite(zero_point)))
+
+    def test_get_min_max_value_per_channel_weight(self):
+        # the flattened aminmax path must match the per-dim amin/amax reduction
+        weight = torch.randn(4, 3, 5, 5)
+        expected_min = torch.amin(weight, [1, 2, 3], keepdim=True)
+        expected_max = torch.amax(weight, [1, 2, 3], keepdim=True)
+        for qscheme in ['per_channel_affine', 'per_channel_symmetric']:
+            min_val, max_val = get_min_max_value(weight, 'weight', qscheme)
+            self.assertEqual(min_val.shape, expected_min.shape)
+            self.assertEqual(max_val.shape, expected_max.shape)
+            self.assertTrue(torch.equal(min_val, expected_min))
+            self.assertTrue(torch.equal(max_val, expected_max))
+
     def test_torch_quantizer_export(self):
         config_list_qat = [{
             'quant_types': ['weight'],